@@ -3,15 +3,35 @@ scripts/common.py
 Shared utilities for GitHub Battleships game
 """
 
+import functools
 import json
 import os
 import random
+import re
 import fcntl
 import hashlib
+from collections import Counter
+from itertools import islice
+from operator import itemgetter
 from datetime import datetime, timedelta, UTC
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 
+# orjson parses and serializes several times faster than stdlib json;
+# fall back silently when it isn't installed
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps_indent(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps_indent(data) -> bytes:
+        return json.dumps(data, indent=2).encode()
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -44,15 +64,55 @@ CONFIG = {
     "DIRECTORIES": ["game", "game2", "rounds"]
 }
 
+# Cell mark -> display emoji for board rendering
+CELL_EMOJI = {"X": "💥", "O": "🌊", "🚢": "🚢", "": "⬜"}
+
+# Precomputed cell names ("A1".."J10"), built once at import
+_CELLS = tuple(f"{r}{c}" for r in CONFIG["BOARD_ROWS"] for c in CONFIG["BOARD_COLS"])
+
+# Bit index per cell so cell collections can be packed into a 100-bit int
+_CELL_BIT = {cell: i for i, cell in enumerate(_CELLS)}
+
+# Packed board form: 100 bytes in row-major order (index = row*10 + col),
+# one mark code per cell. The JSON dict stays the interchange format;
+# these tables convert at the boundary.
+MARK_CODE = {"": 0, "X": 1, "O": 2, "🚢": 3}
+CODE_MARK = ("", "X", "O", "🚢")
+_EMOJI_BY_CODE = ("⬜", "💥", "🌊", "🚢")
+
+def board_to_bytes(board: Dict[str, str]) -> bytearray:
+    """Pack the dict board into a flat 100-byte row-major array"""
+    mark_code = MARK_CODE
+    board_get = board.get
+    packed = bytearray(len(_CELLS))
+    for i, cell in enumerate(_CELLS):
+        packed[i] = mark_code.get(board_get(cell, ""), 0)
+    return packed
+
+def bytes_to_board(packed) -> Dict[str, str]:
+    """Expand a packed board back into the JSON dict form"""
+    code_mark = CODE_MARK
+    return {cell: code_mark[packed[i]] for i, cell in enumerate(_CELLS)}
+
+def _cells_mask(cells) -> int:
+    """Pack an iterable of cell names into a bitmask (unknown cells skipped)"""
+    mask = 0
+    bits = _CELL_BIT
+    for cell in cells:
+        idx = bits.get(cell)
+        if idx is not None:
+            mask |= 1 << idx
+    return mask
+
 # ============================================================================
 # FILE OPERATIONS WITH LOCKING
 # ============================================================================
 
-def acquire_lock(file_path: str, timeout: int = 30) -> bool:
-    """Try to acquire exclusive lock on file"""
+def acquire_lock(file_path: str) -> bool:
+    """Acquire exclusive lock on file, blocking until the holder releases"""
     try:
         f = open(file_path, "a+")
-        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
         return True
     except (IOError, OSError):
         return False
@@ -70,57 +130,95 @@ def load_json_safe(file_path: str, default: any = None, use_lock: bool = False)
     """Safely load JSON with optional file locking"""
     try:
         if use_lock:
-            # Retry logic for lock acquisition
-            max_retries = 5
-            for attempt in range(max_retries):
-                try:
-                    with open(file_path, "r") as f:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_SH)
-                        data = json.load(f)
-                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-                        return data
-                except (IOError, OSError):
-                    if attempt < max_retries - 1:
-                        import time
-                        time.sleep(0.5)
-                    else:
-                        raise
+            # Blocking shared lock: the kernel wakes us as soon as the
+            # writer releases, with no polling granularity
+            with open(file_path, "rb") as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+                return _loads(f.read())
         else:
-            with open(file_path, "r") as f:
-                return json.load(f)
+            with open(file_path, "rb") as f:
+                return _loads(f.read())
     except FileNotFoundError:
         return default if default is not None else {}
-    except json.JSONDecodeError:
+    except ValueError:
+        # Covers both json.JSONDecodeError and orjson.JSONDecodeError
         return default if default is not None else {}
 
+def _content_changed(file_path: str, payload: bytes) -> bool:
+    """True unless the file already holds exactly these bytes.
+
+    Skipping no-op writes avoids the disk flush and, downstream, keeps
+    unchanged files out of the workflow's git diff.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            return f.read() != payload
+    except OSError:
+        return True
+
 def save_json_safe(file_path: str, data: any, use_lock: bool = False) -> bool:
-    """Safely save JSON with optional file locking"""
+    """Safely save JSON with optional file locking.
+
+    The payload is serialized once in memory, written to a sidecar and
+    os.replace'd into place, so a crash mid-write can never leave a
+    truncated file behind.
+    """
     try:
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
+
+        payload = _dumps_indent(data)
+        tmp = file_path + ".tmp"
+
+        if not _content_changed(file_path, payload):
+            return True
+
         if use_lock:
-            max_retries = 5
-            for attempt in range(max_retries):
-                try:
-                    with open(file_path, "w") as f:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                        json.dump(data, f, indent=2)
-                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-                    return True
-                except (IOError, OSError):
-                    if attempt < max_retries - 1:
-                        import time
-                        time.sleep(0.5)
-                    else:
-                        raise
+            # Lock a stable sidecar path (the data file's inode changes
+            # on every os.replace) so concurrent savers serialize
+            with open(file_path + ".lock", "a+") as lock_f:
+                fcntl.flock(lock_f.fileno(), fcntl.LOCK_EX)
+                with open(tmp, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp, file_path)
         else:
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=2)
-            return True
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, file_path)
+        return True
     except Exception as e:
         print(f"ERROR: Failed to save {file_path}: {str(e)}")
         return False
 
+def save_json_batch(updates: List[tuple]) -> bool:
+    """Save several JSON files under one coarse lock.
+
+    Takes (file_path, data) pairs. Serializes every payload in memory
+    first, then writes them back-to-back while holding a single
+    exclusive lock on game2/.state.lock — one lock acquire/release
+    cycle instead of one per file.
+    """
+    try:
+        payloads = []
+        for file_path, data in updates:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            payloads.append((file_path, _dumps_indent(data)))
+
+        os.makedirs("game2", exist_ok=True)
+        with open("game2/.state.lock", "a+") as lock_f:
+            fcntl.flock(lock_f.fileno(), fcntl.LOCK_EX)
+            for file_path, payload in payloads:
+                if not _content_changed(file_path, payload):
+                    continue
+                tmp = file_path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp, file_path)
+            fcntl.flock(lock_f.fileno(), fcntl.LOCK_UN)
+        return True
+    except Exception as e:
+        print(f"ERROR: Failed to save batch: {str(e)}")
+        return False
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -158,82 +256,110 @@ def ensure_directories():
 
 def init_empty_board() -> Dict[str, str]:
     """Initialize empty 10x10 board"""
-    board = {}
-    for row in CONFIG["BOARD_ROWS"]:
-        for col in CONFIG["BOARD_COLS"]:
-            board[f"{row}{col}"] = ""
-    return board
+    return dict.fromkeys(_CELLS, "")
 
 # ============================================================================
 # SHIP PLACEMENT
 # ============================================================================
 
-def place_ship(size: int, occupied: Set[str]) -> Optional[List[str]]:
-    """Place a ship of given size without overlapping occupied cells"""
+def _placement_cells(orientation: str, row_idx: int, col_idx: int, size: int) -> Tuple[str, ...]:
+    """Cell names covered by a placement triple"""
+    if orientation == "H":
+        return tuple(_CELLS[row_idx * 10 + col_idx + i] for i in range(size))
+    return tuple(_CELLS[(row_idx + i) * 10 + col_idx] for i in range(size))
+
+def _placement_mask(orientation: str, row_idx: int, col_idx: int, size: int) -> int:
+    """Occupancy bitmask covered by a placement triple"""
+    base = row_idx * 10 + col_idx
+    if orientation == "H":
+        return ((1 << size) - 1) << base
+    return sum(1 << (base + 10 * i) for i in range(size))
+
+# Every in-bounds placement per ship size, fully materialized as
+# (cells, mask) pairs so the retry loop does no per-attempt arithmetic
+_VALID_PLACEMENTS = {
+    size: tuple(
+        (_placement_cells(o, r, c, size), _placement_mask(o, r, c, size))
+        for o in ("H", "V")
+        for r in range(CONFIG["BOARD_SIZE"])
+        for c in range(CONFIG["BOARD_SIZE"])
+        if (c + size <= CONFIG["BOARD_SIZE"] if o == "H" else r + size <= CONFIG["BOARD_SIZE"])
+    )
+    for size in set(CONFIG["SHIPS"].values())
+}
+
+def place_ship(size: int, occupied_mask: int) -> Optional[Tuple[Tuple[str, ...], int]]:
+    """
+    Place a ship of given size without overlapping occupied cells.
+    Returns (cells, cells_mask) or None if no placement was found.
+    """
+    placements = _VALID_PLACEMENTS[size]
     for _ in range(CONFIG["MAX_SHIP_PLACEMENT_ATTEMPTS"]):
-        orientation = random.choice(["H", "V"])
-        row = random.choice(CONFIG["BOARD_ROWS"])
-        col = random.choice(CONFIG["BOARD_COLS"])
-        
-        cells = []
-        
-        if orientation == "H":
-            start_col = col
-            if start_col + size - 1 > CONFIG["BOARD_SIZE"]:
-                continue
-            cells = [f"{row}{start_col + i}" for i in range(size)]
-        else:
-            start_row = CONFIG["BOARD_ROWS"].index(row)
-            if start_row + size - 1 > len(CONFIG["BOARD_ROWS"]) - 1:
-                continue
-            cells = [f"{CONFIG['BOARD_ROWS'][start_row + i]}{col}" for i in range(size)]
-        
-        if any(cell in occupied for cell in cells):
+        cells, cells_mask = random.choice(placements)
+
+        # Overlap test is a single AND against the occupancy bitmask
+        if cells_mask & occupied_mask:
             continue
-        
-        return cells
-    
+
+        return cells, cells_mask
+
     return None
 
 def generate_ships() -> Tuple[Optional[Dict[str, str]], str]:
     """Generate new random ship configuration. Returns (ships_dict, error_msg)"""
-    occupied = set()
+    occupied_mask = 0
     ship_map = {}
-    
+
     for ship_name, size in CONFIG["SHIPS"].items():
-        cells = place_ship(size, occupied)
-        if cells is None:
+        placed = place_ship(size, occupied_mask)
+        if placed is None:
             error_msg = f"Failed to place {ship_name} (size {size}) after {CONFIG['MAX_SHIP_PLACEMENT_ATTEMPTS']} attempts"
             return None, error_msg
-        
+
+        cells, cells_mask = placed
+        occupied_mask |= cells_mask
         for cell in cells:
             ship_map[cell] = ship_name
-            occupied.add(cell)
-    
+
     return ship_map, ""
 
 # ============================================================================
 # SECURITY - CHECKSUMS
 # ============================================================================
 
+def _cell_digest(cell: str, mark: str) -> int:
+    """Digest of a single (cell, mark) pair as an int"""
+    return int.from_bytes(hashlib.sha256(f"{cell}:{mark}".encode()).digest(), "big")
+
 def calculate_board_checksum(board: Dict[str, str]) -> str:
-    """Calculate checksum of current board state for tampering detection"""
-    board_str = json.dumps(board, sort_keys=True)
-    return hashlib.sha256(board_str.encode()).hexdigest()
+    """
+    Calculate checksum of current board state for tampering detection.
+    XOR of per-cell digests, so the checksum can be updated in O(1)
+    per move via update_board_checksum instead of re-hashing the board.
+    """
+    checksum = 0
+    for cell, mark in board.items():
+        checksum ^= _cell_digest(cell, mark)
+    return f"{checksum:064x}"
+
+def update_board_checksum(checksum: str, cell: str, old_mark: str, new_mark: str) -> str:
+    """Incrementally update a board checksum after a single-cell change"""
+    value = int(checksum, 16)
+    value ^= _cell_digest(cell, old_mark)
+    value ^= _cell_digest(cell, new_mark)
+    return f"{value:064x}"
 
 def verify_board_integrity(board: Dict[str, str], ships: Dict[str, str]) -> bool:
     """Verify board state is consistent with ships"""
-    # All cells should be valid
-    for cell in board.keys():
-        if not is_valid_move(cell):
-            return False
-    
+    # All cells should be valid: one C-level subset check on the key
+    # views instead of a Python-level membership loop
+    if not board.keys() <= _CELL_BIT.keys():
+        return False
+
     # All X marks should correspond to ship locations
-    for cell, mark in board.items():
-        if mark == "X" and cell not in ships:
-            return False
-    
-    return True
+    hit_mask = _cells_mask(cell for cell, mark in board.items() if mark == "X")
+    ship_mask = _cells_mask(ships)
+    return hit_mask & ~ship_mask == 0
 
 # ============================================================================
 # MOVE VALIDATION & HISTORY
@@ -285,6 +411,10 @@ def check_cooldown(player_data: Dict, username: str, now: datetime = None) -> Tu
     
     return True, ""
 
+def parse_move_rc(move: str) -> List[int]:
+    """Parse a cell name into integer [row_idx, col] (col 1-based)"""
+    return [ord(move[0]) - 65, int(move[1:])]
+
 def detect_pattern(move_history: List[Dict], username: str) -> Tuple[bool, str]:
     """
     Detect systematic patterns (anti-cheat).
@@ -292,19 +422,23 @@ def detect_pattern(move_history: List[Dict], username: str) -> Tuple[bool, str]:
     """
     recent_moves = [m for m in move_history if m["username"] == username]
     recent_moves = recent_moves[-CONFIG["PATTERN_DETECTION_THRESHOLD"]:]
-    
+
     if len(recent_moves) < CONFIG["PATTERN_DETECTION_THRESHOLD"]:
         return False, ""
-    
-    moves_list = [m["move"] for m in recent_moves]
-    rows = [m[0] for m in moves_list]
-    cols = [int(m[1:]) for m in moves_list]
-    
-    # Check for sequential patterns
-    is_sequential_row = all(ord(rows[i]) == ord(rows[i-1]) + 1 for i in range(1, len(rows)))
-    is_sequential_col = all(cols[i] == cols[i-1] + 1 for i in range(1, len(cols)))
-    is_same_row = len(set(rows)) == 1
-    is_same_col = len(set(cols)) == 1
+
+    # History entries carry pre-parsed "rc" coordinates since they were
+    # written; re-parse only legacy entries that predate the field
+    coords = [m.get("rc") or parse_move_rc(m["move"]) for m in recent_moves]
+    rows = [rc[0] for rc in coords]
+    cols = [rc[1] for rc in coords]
+
+    row_diffs = {b - a for a, b in zip(rows, rows[1:])}
+    col_diffs = {b - a for a, b in zip(cols, cols[1:])}
+
+    is_sequential_row = row_diffs == {1}
+    is_sequential_col = col_diffs == {1}
+    is_same_row = row_diffs == {0}
+    is_same_col = col_diffs == {0}
     
     if (is_sequential_row and is_same_col) or (is_sequential_col and is_same_row):
         return True, "⚠️ Pattern detected! Try mixing up your strategy 🎲"
@@ -315,42 +449,41 @@ def detect_pattern(move_history: List[Dict], username: str) -> Tuple[bool, str]:
 # SHIP STATE
 # ============================================================================
 
+def build_ship_index(ships: Dict[str, str]) -> Dict[str, List[str]]:
+    """Invert the cell -> ship map into ship -> [cells]"""
+    index: Dict[str, List[str]] = {}
+    for cell, ship_name in ships.items():
+        index.setdefault(ship_name, []).append(cell)
+    return index
+
 def get_ship_status(ships: Dict[str, str], board: Dict[str, str]) -> Dict:
     """Get detailed status of each ship"""
+    ship_index = build_ship_index(ships)
+    board_get = board.get
+
     ship_info = {}
-    
     for ship_name, size in CONFIG["SHIPS"].items():
+        cells = ship_index.get(ship_name, [])
+        hits = sum(1 for cell in cells if board_get(cell) == "X")
         ship_info[ship_name] = {
             "size": size,
-            "hits": 0,
-            "cells": [],
-            "sunk": False
+            "hits": hits,
+            "cells": cells,
+            "sunk": size > 0 and hits == size
         }
-    
-    for cell, ship_name in ships.items():
-        if ship_name in ship_info:
-            ship_info[ship_name]["cells"].append(cell)
-            if board.get(cell) == "X":
-                ship_info[ship_name]["hits"] += 1
-    
-    # Mark sunk ships
-    for ship_name, info in ship_info.items():
-        if info["size"] > 0 and info["hits"] == info["size"]:
-            info["sunk"] = True
-    
     return ship_info
 
 def get_remaining_ships(ships: Dict[str, str], board: Dict[str, str]) -> int:
     """Get count of remaining ship cells"""
-    all_ship_cells = set(ships.keys())
-    hit_cells = {cell for cell, mark in board.items() if mark == "X"}
-    return len(all_ship_cells) - len(hit_cells)
+    ship_mask = _cells_mask(ships)
+    hit_mask = _cells_mask(cell for cell, mark in board.items() if mark == "X")
+    return (ship_mask & ~hit_mask).bit_count()
 
 def is_game_won(ships: Dict[str, str], board: Dict[str, str]) -> bool:
     """Check if all ships are sunk"""
-    all_ship_cells = set(ships.keys())
-    hit_cells = {cell for cell, mark in board.items() if mark == "X"}
-    return bool(all_ship_cells) and all_ship_cells.issubset(hit_cells)
+    ship_mask = _cells_mask(ships)
+    hit_mask = _cells_mask(cell for cell, mark in board.items() if mark == "X")
+    return ship_mask != 0 and ship_mask & hit_mask == ship_mask
 
 # ============================================================================
 # ACHIEVEMENTS
@@ -389,6 +522,19 @@ ACHIEVEMENTS = {
     }
 }
 
+# Badge display strings, built once from the achievement table
+BADGE_SHARPSHOOTER = "🎯 Sharpshooter"
+BADGE_HOT_STREAK = "🔥 Hot Streak"
+BADGE_FIRST_BLOOD = "⚡ First Blood"
+BADGE_SHIP_SINKER = "🚢 Ship Sinker"
+BADGE_FLEET_DESTROYER = "💀 Fleet Destroyer"
+BADGE_VICTORY_ROYALE = "🏆 Victory Royale"
+
+_ALL_BADGES = frozenset({
+    BADGE_SHARPSHOOTER, BADGE_HOT_STREAK, BADGE_FIRST_BLOOD,
+    BADGE_SHIP_SINKER, BADGE_FLEET_DESTROYER, BADGE_VICTORY_ROYALE,
+})
+
 def check_achievements(
     player: Dict,
     ship_status: Dict,
@@ -399,187 +545,277 @@ def check_achievements(
     Check and return newly unlocked achievements.
     Returns list of new badge strings like "🎯 Sharpshooter"
     """
+    existing = set(existing_badges)
+    # Veterans who already own every badge skip the condition walk entirely
+    if _ALL_BADGES <= existing:
+        return []
+
     new_badges = []
     total_moves = player.get("hits", 0) + player.get("misses", 0)
-    
-    # Sharpshooter
-    if (player.get("accuracy", 0) >= 0.8 and total_moves >= 10 and
-        "🎯 Sharpshooter" not in existing_badges):
-        new_badges.append("🎯 Sharpshooter")
-    
+
+    # Sharpshooter: hits/total >= 0.8 as an exact integer comparison,
+    # immune to the rounding applied to the stored accuracy float
+    if (player.get("hits", 0) * 5 >= total_moves * 4 and total_moves >= 10 and
+        BADGE_SHARPSHOOTER not in existing):
+        new_badges.append(BADGE_SHARPSHOOTER)
+
     # Hot Streak
-    if (player.get("streak", 0) >= 5 and "🔥 Hot Streak" not in existing_badges):
-        new_badges.append("🔥 Hot Streak")
-    
+    if (player.get("streak", 0) >= 5 and BADGE_HOT_STREAK not in existing):
+        new_badges.append(BADGE_HOT_STREAK)
+
     # First Blood (only if first move AND first hit)
     if (player.get("hits", 0) == 1 and player.get("misses", 0) == 0 and
-        "⚡ First Blood" not in existing_badges):
-        new_badges.append("⚡ First Blood")
-    
+        BADGE_FIRST_BLOOD not in existing):
+        new_badges.append(BADGE_FIRST_BLOOD)
+
     # Ship Sinker
-    if (player.get("ships_sunk", 0) >= 1 and "🚢 Ship Sinker" not in existing_badges):
-        new_badges.append("🚢 Ship Sinker")
-    
+    if (player.get("ships_sunk", 0) >= 1 and BADGE_SHIP_SINKER not in existing):
+        new_badges.append(BADGE_SHIP_SINKER)
+
     # Fleet Destroyer
-    if (player.get("ships_sunk", 0) >= 3 and "💀 Fleet Destroyer" not in existing_badges):
-        new_badges.append("💀 Fleet Destroyer")
-    
+    if (player.get("ships_sunk", 0) >= 3 and BADGE_FLEET_DESTROYER not in existing):
+        new_badges.append(BADGE_FLEET_DESTROYER)
+
     # Victory Royale
-    if game_won and "🏆 Victory Royale" not in existing_badges:
-        new_badges.append("🏆 Victory Royale")
-    
+    if game_won and BADGE_VICTORY_ROYALE not in existing:
+        new_badges.append(BADGE_VICTORY_ROYALE)
+
     return new_badges
 
 # ============================================================================
 # RENDERING
 # ============================================================================
 
+# Header and divider never change; built once instead of per render
+_BOARD_HEADER = "|   | " + " | ".join(str(i) for i in range(1, 11)) + " |\n"
+_BOARD_DIVIDER = "|---|" + "---|" * 10 + "\n"
+
+@functools.lru_cache(maxsize=8)
+def _render_board_packed(packed: bytes) -> str:
+    """Render the packed board form; memo keys are 100-byte strings"""
+    parts = [_BOARD_HEADER, _BOARD_DIVIDER]
+
+    emoji = _EMOJI_BY_CODE
+
+    for i, row in enumerate(CONFIG["BOARD_ROWS"]):
+        base = i * 10
+        cells = [emoji[code] for code in packed[base:base + 10]]
+        parts.append(f"| {row} | " + " | ".join(cells) + " |\n")
+
+    return "".join(parts)
+
 def render_board(board: Dict[str, str]) -> str:
     """Render board as markdown table"""
-    header = "|   | " + " | ".join(str(i) for i in range(1, 11)) + " |\n"
-    divider = "|---|" + "---|" * 10 + "\n"
-    rows = ""
-    
-    for row in CONFIG["BOARD_ROWS"]:
-        cells = []
-        for col in CONFIG["BOARD_COLS"]:
-            cell = board.get(f"{row}{col}", " ")
-            if cell == "X":
-                cells.append("💥")
-            elif cell == "O":
-                cells.append("🌊")
-            elif cell == "🚢":
-                cells.append("🚢")
-            else:
-                cells.append("⬜")
-        rows += f"| {row} | " + " | ".join(cells) + " |\n"
-    
-    return header + divider + rows
+    return _render_board_packed(bytes(board_to_bytes(board)))
+
+def render_board_cached(board: Dict[str, str]) -> str:
+    """Memoized render_board; repeated renders of identical state are free"""
+    return render_board(board)
+
+@functools.lru_cache(maxsize=8)
+def _render_ship_status_cached(ship_items: Tuple[Tuple[str, str], ...],
+                               board_items: Tuple[Tuple[str, str], ...]) -> str:
+    return render_ship_status(dict(ship_items), dict(board_items))
+
+def render_ship_status_cached(ships: Dict[str, str], board: Dict[str, str]) -> str:
+    """Memoized render_ship_status keyed by (ships, board) state"""
+    return _render_ship_status_cached(tuple(sorted(ships.items())), tuple(sorted(board.items())))
 
 def render_ship_status(ships: Dict[str, str], board: Dict[str, str]) -> str:
     """Render fleet status"""
-    status_text = "### 🚢 Fleet Status\n\n"
+    parts = ["### 🚢 Fleet Status\n\n"]
     ship_status = get_ship_status(ships, board)
-    
-    for ship_name in CONFIG["SHIPS"].keys():
+    ships_cfg = CONFIG["SHIPS"]
+    ship_emojis = CONFIG["SHIP_EMOJIS"]
+
+    for ship_name in ships_cfg.keys():
         info = ship_status[ship_name]
-        emoji = CONFIG["SHIP_EMOJIS"].get(ship_name, "🚢")
-        
+        emoji = ship_emojis.get(ship_name, "🚢")
+
         if info["sunk"]:
             status = "💀 **SUNK**"
         elif info["hits"] > 0:
             status = f"🔥 **{info['hits']}/{info['size']}** damaged"
         else:
             status = "✅ Afloat"
-        
-        status_text += f"- {emoji} **{ship_name.upper()}** ({info['size']} cells): {status}\n"
-    
-    return status_text
+
+        parts.append(f"- {emoji} **{ship_name.upper()}** ({info['size']} cells): {status}\n")
+
+    return "".join(parts)
 
 def render_move_history(move_history: List[Dict]) -> str:
     """Render recent moves"""
-    history_text = "### 📜 Recent Moves\n\n"
-    
+    parts = ["### 📜 Recent Moves\n\n"]
+
     if not move_history:
-        return history_text + "*No moves yet! Be the first to fire!*\n"
-    
-    recent = move_history[-10:][::-1]
-    
-    for entry in recent:
+        return parts[0] + "*No moves yet! Be the first to fire!*\n"
+
+    # Newest-first without materializing the two intermediate copies
+    # that slicing-then-reversing made
+    for entry in islice(reversed(move_history), 10):
         result_emoji = "💥" if entry["result"] == "Hit" else "🌊"
         ship_info = f" ({entry['ship']})" if entry.get('ship') else ""
-        history_text += f"- {result_emoji} @{entry['username']}: `{entry['move']}` - {entry['result']}{ship_info}\n"
-    
-    return history_text
+        parts.append(f"- {result_emoji} @{entry['username']}: `{entry['move']}` - {entry['result']}{ship_info}\n")
+
+    return "".join(parts)
 
 def render_game_stats(board: Dict[str, str], ships: Dict[str, str], leaderboard: Dict) -> str:
     """Render game statistics"""
     remaining = get_remaining_ships(ships, board)
     total_ship_cells = len(ships)
     
-    total_moves = sum(1 for cell in board.values() if cell in ["X", "O"])
-    hit_cells = {cell for cell, mark in board.items() if mark == "X"}
-    total_hits = len(hit_cells)
-    total_misses = total_moves - total_hits
-    
+    # One C-level pass over the board instead of a Python counting loop
+    counts = Counter(board.values())
+    total_hits = counts.get("X", 0)
+    total_misses = counts.get("O", 0)
+    total_moves = total_hits + total_misses
+
     community_accuracy = round(total_hits / total_moves * 100, 1) if total_moves > 0 else 0
     
-    stats_text = "### 📊 Game Statistics\n\n"
-    stats_text += f"- 🎯 **Ship Cells Remaining:** {remaining}/{total_ship_cells}\n"
-    stats_text += f"- 🎲 **Total Moves:** {total_moves}\n"
-    stats_text += f"- 💥 **Total Hits:** {total_hits}\n"
-    stats_text += f"- 🌊 **Total Misses:** {total_misses}\n"
-    stats_text += f"- 📈 **Community Accuracy:** {community_accuracy}%\n"
-    stats_text += f"- 👥 **Active Players:** {len(leaderboard)}\n"
-    
-    return stats_text
+    return (
+        "### 📊 Game Statistics\n\n"
+        f"- 🎯 **Ship Cells Remaining:** {remaining}/{total_ship_cells}\n"
+        f"- 🎲 **Total Moves:** {total_moves}\n"
+        f"- 💥 **Total Hits:** {total_hits}\n"
+        f"- 🌊 **Total Misses:** {total_misses}\n"
+        f"- 📈 **Community Accuracy:** {community_accuracy}%\n"
+        f"- 👥 **Active Players:** {len(leaderboard)}\n"
+    )
 
 def render_leaderboard(leaderboard: Dict, achievements: Dict) -> str:
     """Render current game leaderboard"""
     header = "| Rank | Player | 🖼️ Avatar | 🏹 Hits | 💦 Misses | 🎯 Accuracy | 🔥 Streak | 🚢 Sunk |\n"
     divider = "|------|--------|-----------|----------|------------|--------------|------------|----------|\n"
-    rows = ""
-    
-    sorted_players = sorted(
-        leaderboard.items(),
-        key=lambda x: (x[1]["hits"], x[1]["accuracy"], x[1].get("ships_sunk", 0)),
-        reverse=True
-    )
-    
-    for i, (uid, stats) in enumerate(sorted_players, start=1):
+    rows = []
+
+    # Extract each sort key once so the sort compares plain tuples
+    # instead of re-running a lambda per comparison
+    keyed = [
+        ((stats["hits"], stats["accuracy"], stats.get("ships_sunk", 0)), uid, stats)
+        for uid, stats in leaderboard.items()
+    ]
+    keyed.sort(key=itemgetter(0), reverse=True)
+
+    for i, (_, uid, stats) in enumerate(keyed, start=1):
         player_name = stats.get("username", uid)
+        ships_sunk = stats.get("ships_sunk", 0)
         rank = ["🥇", "🥈", "🥉"][i - 1] if i <= 3 else str(i)
         avatar_url = f"https://github.com/{player_name}.png"
         avatar_md = f"<img src='{avatar_url}' width='32' height='32'>"
-        
+
         player_achievements = achievements.get(uid, {}).get("badges", [])
         badge_display = " ".join(player_achievements[:3]) if player_achievements else ""
         player_display = f"@{player_name} {badge_display}".strip()
-        
-        row = f"| {rank} | {player_display} | {avatar_md} | {stats['hits']} | {stats['misses']} | {stats['accuracy']} | {stats['streak']} | {stats.get('ships_sunk', 0)} |\n"
-        rows += row
-    
-    return header + divider + (rows if rows else "| - | *No players yet* | - | - | - | - | - | - |\n")
+
+        rows.append(f"| {rank} | {player_display} | {avatar_md} | {stats['hits']} | {stats['misses']} | {stats['accuracy']} | {stats['streak']} | {ships_sunk} |\n")
+
+    return header + divider + ("".join(rows) if rows else "| - | *No players yet* | - | - | - | - | - | - |\n")
 
 def render_all_time_leaderboard(all_time_lb: Dict) -> str:
     """Render all-time leaderboard"""
     header = "| Rank | Player | 🏹 Total Hits | 🏆 Wins | 🎮 Games | 🔥 Best Streak | 🚢 Ships Sunk |\n"
     divider = "|------|--------|---------------|---------|----------|----------------|----------------|\n"
-    rows = ""
-    
+
     if not all_time_lb:
         return header + divider + "| - | *No players yet* | - | - | - | - | - |\n"
-    
-    sorted_players = sorted(
-        all_time_lb.items(),
-        key=lambda x: (x[1]["games_won"], x[1]["total_hits"], x[1]["ships_sunk"]),
-        reverse=True
-    )
-    
-    for i, (uid, stats) in enumerate(sorted_players, start=1):
+
+    keyed = [
+        ((stats["games_won"], stats["total_hits"], stats["ships_sunk"]), uid, stats)
+        for uid, stats in all_time_lb.items()
+    ]
+    keyed.sort(key=itemgetter(0), reverse=True)
+
+    rows = []
+    for i, (_, uid, stats) in enumerate(keyed, start=1):
         player_name = stats.get("username", uid)
         rank = ["👑", "🥈", "🥉"][i - 1] if i <= 3 else str(i)
-        
-        row = f"| {rank} | @{player_name} | {stats['total_hits']} | {stats['games_won']} | {stats['games_played']} | {stats.get('best_streak', 0)} | {stats['ships_sunk']} |\n"
-        rows += row
-    
-    return header + divider + rows
+
+        rows.append(f"| {rank} | @{player_name} | {stats['total_hits']} | {stats['games_won']} | {stats['games_played']} | {stats.get('best_streak', 0)} | {stats['ships_sunk']} |\n")
+
+    return header + divider + "".join(rows)
+
+@functools.lru_cache(maxsize=32)
+def _section_re(start_marker: str, end_marker: str):
+    """Compiled pattern matching a marker-delimited README section"""
+    return re.compile(re.escape(start_marker) + r".*?" + re.escape(end_marker), re.DOTALL)
 
 def update_readme_section(readme: str, start_marker: str, end_marker: str, content: str) -> str:
     """Update a specific section of README between markers"""
-    start = readme.find(start_marker)
-    end = readme.find(end_marker)
-    
-    if start == -1 or end == -1:
-        return readme
-    
-    end += len(end_marker)
-    return readme[:start] + start_marker + "\n" + content + end_marker + readme[end:]
+    replacement = start_marker + "\n" + content + end_marker
+    new_readme, count = _section_re(start_marker, end_marker).subn(
+        lambda m: replacement, readme, count=1
+    )
+    return new_readme if count else readme
+
+def update_readme_sections(readme, sections: List[Tuple[str, str, str]]):
+    """Replace several marker-delimited sections in one pass.
+
+    sections is a list of (start_marker, end_marker, content) tuples;
+    content may also be a zero-arg callable, rendered only if its
+    marker pair actually appears in the README. One combined regex
+    walks the README once instead of rescanning and rebuilding the
+    full string per section; marker pairs that don't appear are
+    skipped. readme may be str or bytes — bytes in, bytes out, which
+    skips per-call UTF-8 decode/encode of the emoji-heavy README and
+    matches with C-level bytes searching.
+    """
+    as_bytes = isinstance(readme, bytes)
+    contents = {}
+    markers = {}
+    patterns = []
+    for start_marker, end_marker, content in sections:
+        if as_bytes:
+            start_marker = start_marker.encode()
+            end_marker = end_marker.encode()
+            patterns.append(re.escape(start_marker) + rb".*?" + re.escape(end_marker))
+        else:
+            patterns.append(re.escape(start_marker) + r".*?" + re.escape(end_marker))
+        contents[start_marker] = content
+        markers[start_marker] = end_marker
+    joiner = b"|" if as_bytes else "|"
+    combined = re.compile(joiner.join(patterns), re.DOTALL)
+
+    def _replace(match):
+        matched = match.group(0)
+        for start_marker, content in contents.items():
+            if matched.startswith(start_marker):
+                if callable(content):
+                    content = content()
+                if as_bytes:
+                    content = content.encode()
+                    return start_marker + b"\n" + content + markers[start_marker]
+                return start_marker + "\n" + content + markers[start_marker]
+        return matched
+
+    return combined.sub(_replace, readme)
 
 # ============================================================================
 # ARCHIVING
 # ============================================================================
 
+def next_round_number() -> int:
+    """Allocate the next round number from the rounds/.next counter.
+
+    The counter (shared with archive_and_reset) is advanced under an
+    exclusive lock; a missing or corrupted counter falls back to a
+    one-time scan of the existing archives.
+    """
+    os.makedirs("rounds", exist_ok=True)
+    with open("rounds/.next", "a+") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        f.seek(0)
+        raw = f.read().strip()
+        if raw.isdigit():
+            num = int(raw)
+        else:
+            with os.scandir("rounds") as it:
+                num = sum(1 for e in it if e.name.startswith("round_")) + 1
+        f.seek(0)
+        f.truncate()
+        f.write(str(num + 1))
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    return num
+
 def archive_round(
     round_num: int,
     board: Dict[str, str],
@@ -593,11 +829,8 @@ def archive_round(
     try:
         timestamp = datetime.now(UTC).isoformat()
         
-        # Reveal ships
-        revealed_board = board.copy()
-        for coord in ships:
-            if revealed_board.get(coord) == "":
-                revealed_board[coord] = "🚢"
+        # Reveal ships (single C-level merge instead of copy + loop)
+        revealed_board = {**board, **{coord: "🚢" for coord in ships if board.get(coord) == ""}}
         
         round_data = {
             "timestamp": timestamp,
@@ -616,3 +849,35 @@ def archive_round(
         return save_json_safe(round_file, round_data, use_lock=True), round_file
     except Exception as e:
         return False, str(e)
+
+# ============================================================================
+# GITHUB HELPERS
+# ============================================================================
+
+def comment_and_close(issue, body: str, token: str) -> None:
+    """Post a comment and close the issue in one GraphQL round-trip.
+
+    Falls back to the two PyGithub REST calls if the mutation fails.
+    """
+    import requests
+
+    mutation = (
+        "mutation($id: ID!, $body: String!) {"
+        " addComment(input: {subjectId: $id, body: $body}) { clientMutationId }"
+        " closeIssue(input: {issueId: $id}) { clientMutationId }"
+        "}"
+    )
+    try:
+        resp = requests.post(
+            "https://api.github.com/graphql",
+            json={"query": mutation, "variables": {"id": issue.raw_data["node_id"], "body": body}},
+            headers={"Authorization": f"bearer {token}"},
+            timeout=30,
+        )
+        if resp.ok and not resp.json().get("errors"):
+            return
+    except Exception as e:
+        print(f"WARNING: GraphQL comment/close failed, falling back to REST: {str(e)}")
+    # Fallback: two REST calls
+    issue.create_comment(body)
+    issue.edit(state="closed")
@@ -11,11 +11,26 @@ This module prevents:
 
 import os
 import json
-import hashlib
+import heapq
+from hashlib import blake2b, md5
+from itertools import islice
 from datetime import datetime, timedelta, UTC
 from typing import Tuple, Dict, Optional
 from pathlib import Path
 
+# orjson is much faster for the tracking files' nested payloads; fall back
+# to stdlib json when it isn't installed
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps(data) -> bytes:
+        # default=list lets in-memory sets (IP user records) serialize as-is
+        return orjson.dumps(data, default=list)
+except ImportError:
+    _loads = json.loads
+    def _dumps(data) -> bytes:
+        return json.dumps(data, separators=(",", ":"), default=list).encode()
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -35,45 +50,74 @@ DUPLICATE_CONFIG = {
 # LOAD/SAVE TRACKING DATA
 # ============================================================================
 
-def load_duplicate_log() -> Dict:
-    """Load duplicate attempt log"""
+# Tracking files are loaded once per process and mutated in memory; dirty
+# state is written back in one flush instead of a load+save cycle per check
+_dup_log_cache: Optional[Dict] = None
+_ip_tracking_cache: Optional[Dict] = None
+_dirty = {"dup_log": False, "ip_tracking": False}
+
+def _read_json_file(file_path: str) -> Dict:
     try:
-        if os.path.exists(DUPLICATE_CONFIG["DUPLICATE_ATTEMPTS_LOG_FILE"]):
-            with open(DUPLICATE_CONFIG["DUPLICATE_ATTEMPTS_LOG_FILE"], "r") as f:
-                return json.load(f)
+        if os.path.exists(file_path):
+            with open(file_path, "rb") as f:
+                return _loads(f.read())
     except:
         pass
     return {}
 
-def save_duplicate_log(log: Dict) -> bool:
-    """Save duplicate attempt log"""
+def _write_tracking_file(file_path: str, data: Dict) -> bool:
     try:
         os.makedirs("game2", exist_ok=True)
-        with open(DUPLICATE_CONFIG["DUPLICATE_ATTEMPTS_LOG_FILE"], "w") as f:
-            json.dump(log, f, indent=2)
+        # Write to a sidecar then atomically rename, so a workflow killed
+        # mid-write can never leave a truncated file (which the silent
+        # load fallback would replace with {}, losing all history)
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            # Machine-only files: compact form, no indent
+            f.write(_dumps(data))
+        os.replace(tmp_path, file_path)
         return True
     except:
         return False
 
+def load_duplicate_log() -> Dict:
+    """Load duplicate attempt log (cached in-process)"""
+    global _dup_log_cache
+    if _dup_log_cache is None:
+        _dup_log_cache = _read_json_file(DUPLICATE_CONFIG["DUPLICATE_ATTEMPTS_LOG_FILE"])
+    return _dup_log_cache
+
+def save_duplicate_log(log: Dict) -> bool:
+    """Save duplicate attempt log"""
+    global _dup_log_cache
+    _dup_log_cache = log
+    _dirty["dup_log"] = False
+    return _write_tracking_file(DUPLICATE_CONFIG["DUPLICATE_ATTEMPTS_LOG_FILE"], log)
+
 def load_ip_tracking() -> Dict:
-    """Load IP tracking data"""
-    try:
-        if os.path.exists(DUPLICATE_CONFIG["IP_TRACKING_FILE"]):
-            with open(DUPLICATE_CONFIG["IP_TRACKING_FILE"], "r") as f:
-                return json.load(f)
-    except:
-        pass
-    return {}
+    """Load IP tracking data (cached in-process)"""
+    global _ip_tracking_cache
+    if _ip_tracking_cache is None:
+        _ip_tracking_cache = _read_json_file(DUPLICATE_CONFIG["IP_TRACKING_FILE"])
+        # Per-IP user lists are kept as sets while in memory; the serializer
+        # converts them back to lists on save
+        for record in _ip_tracking_cache.get("ip_records", {}).values():
+            record["users"] = set(record.get("users", []))
+    return _ip_tracking_cache
 
 def save_ip_tracking(tracking: Dict) -> bool:
     """Save IP tracking data"""
-    try:
-        os.makedirs("game2", exist_ok=True)
-        with open(DUPLICATE_CONFIG["IP_TRACKING_FILE"], "w") as f:
-            json.dump(tracking, f, indent=2)
-        return True
-    except:
-        return False
+    global _ip_tracking_cache
+    _ip_tracking_cache = tracking
+    _dirty["ip_tracking"] = False
+    return _write_tracking_file(DUPLICATE_CONFIG["IP_TRACKING_FILE"], tracking)
+
+def flush_tracking() -> None:
+    """Write any in-memory tracking mutations back to disk"""
+    if _dirty["dup_log"] and _dup_log_cache is not None:
+        save_duplicate_log(_dup_log_cache)
+    if _dirty["ip_tracking"] and _ip_tracking_cache is not None:
+        save_ip_tracking(_ip_tracking_cache)
 
 # ============================================================================
 # IP EXTRACTION & HASHING
@@ -108,7 +152,10 @@ def hash_ip(ip: str) -> str:
     Hash IP for privacy (we only need it for rate limiting).
     We can't recover original IP from hash.
     """
-    return hashlib.sha256(ip.encode()).hexdigest()[:16]
+    # blake2b with an 8-byte digest: faster than sha256 and emits exactly
+    # the 16 hex chars we keep, no truncated 64-char string. This is just
+    # bucketing, not cryptography.
+    return blake2b(ip.encode(), digest_size=8).hexdigest()
 
 # ============================================================================
 # CELL-LEVEL DUPLICATE DETECTION
@@ -156,13 +203,13 @@ def check_recent_move_history(
     Returns:
         (is_spam, message)
     """
-    recent = move_history[-max_recent:] if move_history else []
-    
-    for entry in recent:
+    # Walk the last N entries newest-first without copying a slice; the
+    # first match seen is the most recent attempt
+    for entry in islice(reversed(move_history), max_recent):
         if entry.get("username") == username and entry.get("move") == move:
             timestamp = entry.get("timestamp", "")
             return True, f"⚠️ You already tried `{move}` recently at {timestamp}. Try a different cell!"
-    
+
     return False, ""
 
 # ============================================================================
@@ -171,35 +218,38 @@ def check_recent_move_history(
 
 def check_multi_account_abuse(
     username: str,
-    board: Dict,
-    leaderboard: Dict,
     move_history: list
 ) -> Tuple[bool, str]:
     """
     Detect if same player using multiple accounts.
-    
+
     Heuristics:
     - Accounts hitting same ship in sequence
     - Accounts with nearly identical play patterns
     - Accounts from same IP
-    
+
     Returns:
         (is_suspicious, message)
     """
-    # Get recent moves by this user
-    recent_user_moves = [m for m in move_history if m["username"] == username][-5:]
-    
-    if not recent_user_moves:
+    # Collect the user's last 5 moves walking backwards; stop as soon as
+    # we have them instead of filtering the whole history
+    recent_results = []
+    for m in reversed(move_history):
+        if m["username"] == username:
+            recent_results.append(m.get("result"))
+            if len(recent_results) == 5:
+                break
+
+    if not recent_results:
         return False, ""
-    
+
     # Check if moves are suspiciously perfect (all hits or perfect pattern)
-    recent_results = [m.get("result") for m in recent_user_moves]
     hit_ratio = sum(1 for r in recent_results if r == "Hit") / len(recent_results)
-    
+
     # 100% hit rate in last 5 moves is suspicious
-    if hit_ratio >= 1.0 and len(recent_user_moves) >= 3:
+    if hit_ratio >= 1.0 and len(recent_results) >= 3:
         return True, "⚠️ Pattern detected - your play seems overly perfect. Please verify you're not using automated tools."
-    
+
     return False, ""
 
 # ============================================================================
@@ -221,34 +271,50 @@ def check_ip_rate_limit(
     Returns:
         (is_rate_limited, message)
     """
-    if not user_ip or not DUPLICATE_CONFIG["TRACK_IP"]:
+    # Bind config lookups once; the filters below touch every history entry
+    track_ip = DUPLICATE_CONFIG["TRACK_IP"]
+    account_rate_limit = DUPLICATE_CONFIG["ACCOUNT_RATE_LIMIT"]
+
+    if not user_ip or not track_ip:
         return False, ""
-    
+
     ip_hash = hash_ip(user_ip)
     now = datetime.now(UTC)
     one_hour_ago = now - timedelta(hours=1)
-    
+    cutoff_epoch = int(now.timestamp()) - 3600
+
     # Find recent moves from this IP
     # (In practice, you'd need to track IP with each move)
     # For now, we'll track usernames as proxy
-    
-    recent_moves = [
-        m for m in move_history
-        if datetime.fromisoformat(m.get("timestamp", "")) > one_hour_ago
-    ]
+
+    # Walk newest-to-oldest; history is chronological, so the first entry
+    # older than the window ends the scan, and the first user match is the
+    # latest move. Prefer the precomputed epoch field: an int compare
+    # instead of re-parsing every ISO timestamp.
+    user_move_count = 0
+    latest_user_move = None
+    for m in reversed(move_history):
+        if "ts_epoch" in m:
+            if m["ts_epoch"] <= cutoff_epoch:
+                break
+        elif datetime.fromisoformat(m.get("timestamp", "")) <= one_hour_ago:
+            break
+        if m.get("username") == username:
+            if latest_user_move is None:
+                latest_user_move = m
+            user_move_count += 1
+            if user_move_count >= account_rate_limit:
+                break
     
     # If same person made multiple moves too quickly
-    user_moves = [m for m in recent_moves if m.get("username") == username]
-    
-    if len(user_moves) >= DUPLICATE_CONFIG["ACCOUNT_RATE_LIMIT"]:
+    if user_move_count >= account_rate_limit and latest_user_move is not None:
         # Calculate wait time
-        if user_moves:
-            last_move_time = datetime.fromisoformat(user_moves[-1].get("timestamp", ""))
-            wait_time = one_hour_ago - last_move_time
-            
-            if wait_time.total_seconds() > 0:
-                minutes_wait = int(wait_time.total_seconds() / 60)
-                return True, f"⚠️ Rate limit: Please wait {minutes_wait} minutes before your next move."
+        last_move_time = datetime.fromisoformat(latest_user_move.get("timestamp", ""))
+        wait_time = one_hour_ago - last_move_time
+
+        if wait_time.total_seconds() > 0:
+            minutes_wait = int(wait_time.total_seconds() / 60)
+            return True, f"⚠️ Rate limit: Please wait {minutes_wait} minutes before your next move."
     
     return False, ""
 
@@ -266,15 +332,18 @@ def log_duplicate_attempt(
     Log duplicate/suspicious attempt for admin review.
     """
     log = load_duplicate_log()
-    
-    timestamp = datetime.now(UTC).isoformat()
-    attempt_id = hashlib.md5(f"{username}{move}{timestamp}".encode()).hexdigest()[:8]
-    
+
+    now = datetime.now(UTC)
+    timestamp = now.isoformat()
+    attempt_id = md5(f"{username}{move}{timestamp}".encode()).hexdigest()[:8]
+
     if "attempts" not in log:
         log["attempts"] = {}
-    
+
+    # ISO string for display/sorting, integer epoch for arithmetic
     log["attempts"][attempt_id] = {
         "timestamp": timestamp,
+        "ts_epoch": int(now.timestamp()),
         "username": username,
         "move": move,
         "reason": reason,
@@ -284,8 +353,8 @@ def log_duplicate_attempt(
     # Keep only last 1000 attempts
     if len(log["attempts"]) > 1000:
         log["attempts"] = dict(list(log["attempts"].items())[-1000:])
-    
-    save_duplicate_log(log)
+
+    _dirty["dup_log"] = True
 
 def get_duplicate_attempts(username: Optional[str] = None) -> list:
     """Get all duplicate attempts, optionally filtered by username"""
@@ -339,10 +408,8 @@ def track_move_ip(
     # Keep only last 100 moves per IP
     record["moves"] = record["moves"][-100:]
     
-    # Convert set to list for JSON serialization
-    tracking["ip_records"][ip_hash]["users"] = list(record["users"])
-    
-    save_ip_tracking(tracking)
+    _dirty["ip_tracking"] = True
+    flush_tracking()
 
 def get_suspicious_ips(min_violations: int = 5) -> list:
     """Get IPs with suspicious activity"""
@@ -367,27 +434,28 @@ def get_suspicious_ips(min_violations: int = 5) -> list:
     
     return suspicious
 
-def increment_ip_violation(user_ip: str) -> None:
-    """Increment violation count for an IP"""
+def increment_ip_violation(user_ip: str, ip_hash: Optional[str] = None) -> None:
+    """Increment violation count for an IP (accepts a pre-computed hash)"""
     if not user_ip:
         return
-    
+
     tracking = load_ip_tracking()
-    ip_hash = hash_ip(user_ip)
+    if ip_hash is None:
+        ip_hash = hash_ip(user_ip)
     
     if "ip_records" not in tracking:
         tracking["ip_records"] = {}
     
     if ip_hash not in tracking["ip_records"]:
         tracking["ip_records"][ip_hash] = {
-            "users": [],
+            "users": set(),
             "moves": [],
             "first_seen": datetime.now(UTC).isoformat(),
             "violation_count": 0
         }
-    
+
     tracking["ip_records"][ip_hash]["violation_count"] += 1
-    save_ip_tracking(tracking)
+    _dirty["ip_tracking"] = True
 
 # ============================================================================
 # MAIN DUPLICATE CHECK FUNCTION
@@ -398,20 +466,18 @@ def check_for_duplicates(
     username: str,
     board: Dict,
     move_history: list,
-    leaderboard: Dict,
     user_ip: Optional[str] = None
 ) -> Tuple[bool, str, str]:
     """
     Comprehensive duplicate/spam check.
-    
+
     Args:
         move: Cell like "B4"
         username: GitHub username
         board: Game board state
         move_history: List of all previous moves
-        leaderboard: Player leaderboard
         user_ip: Player's IP (optional)
-    
+
     Returns:
         (is_duplicate, message, violation_type)
         
@@ -423,35 +489,50 @@ def check_for_duplicates(
         - "multi_account" - Suspicious multi-account pattern
         - None - No violation
     """
-    
+    try:
+        return _check_for_duplicates(move, username, board, move_history, user_ip)
+    finally:
+        # Single disk flush per check cycle regardless of which checks logged
+        flush_tracking()
+
+def _check_for_duplicates(
+    move: str,
+    username: str,
+    board: Dict,
+    move_history: list,
+    user_ip: Optional[str] = None
+) -> Tuple[bool, str, str]:
+    # Hash the IP once up front; every violation branch reuses it
+    ip_hash_val = hash_ip(user_ip) if user_ip else None
+
     # Check 1: Cell already played
     is_dup, msg = check_cell_already_played(move, board)
     if is_dup:
-        log_duplicate_attempt(username, move, "cell_duplicate", hash_ip(user_ip) if user_ip else None)
-        increment_ip_violation(user_ip)
+        log_duplicate_attempt(username, move, "cell_duplicate", ip_hash_val)
+        increment_ip_violation(user_ip, ip_hash=ip_hash_val)
         return True, msg, "cell_duplicate"
-    
+
     # Check 2: Recent move history (spam)
     is_spam, msg = check_recent_move_history(username, move, move_history)
     if is_spam:
-        log_duplicate_attempt(username, move, "move_spam", hash_ip(user_ip) if user_ip else None)
-        increment_ip_violation(user_ip)
+        log_duplicate_attempt(username, move, "move_spam", ip_hash_val)
+        increment_ip_violation(user_ip, ip_hash=ip_hash_val)
         return True, msg, "move_spam"
-    
+
     # Check 3: Account rate limit
     is_limited, msg = check_ip_rate_limit(user_ip, username, move_history)
     if is_limited:
-        log_duplicate_attempt(username, move, "account_spam", hash_ip(user_ip) if user_ip else None)
-        increment_ip_violation(user_ip)
+        log_duplicate_attempt(username, move, "account_spam", ip_hash_val)
+        increment_ip_violation(user_ip, ip_hash=ip_hash_val)
         return True, msg, "account_spam"
-    
+
     # Check 4: Multi-account abuse
-    is_sus, msg = check_multi_account_abuse(username, board, leaderboard, move_history)
+    is_sus, msg = check_multi_account_abuse(username, move_history)
     if is_sus:
-        log_duplicate_attempt(username, move, "multi_account", hash_ip(user_ip) if user_ip else None)
-        increment_ip_violation(user_ip)
+        log_duplicate_attempt(username, move, "multi_account", ip_hash_val)
+        increment_ip_violation(user_ip, ip_hash=ip_hash_val)
         return True, msg, "multi_account"
-    
+
     return False, "", None
 
 # ============================================================================
@@ -462,44 +543,54 @@ def get_duplicate_report() -> str:
     """Generate admin report on duplicate attempts"""
     attempts = get_duplicate_attempts()
     
-    report = f"📋 Duplicate Attempt Report\n\n"
-    report += f"**Total Attempts:** {len(attempts)}\n\n"
-    
+    parts = [
+        "📋 Duplicate Attempt Report\n\n",
+        f"**Total Attempts:** {len(attempts)}\n\n",
+    ]
+
     # Count by reason
     reasons = {}
     for attempt in attempts:
         reason = attempt.get("reason", "unknown")
         reasons[reason] = reasons.get(reason, 0) + 1
-    
-    report += "**By Type:**\n"
-    for reason, count in sorted(reasons.items(), key=lambda x: x[1], reverse=True):
-        report += f"- {reason}: {count}\n"
-    
-    # Recent attempts
-    recent = sorted(attempts, key=lambda x: x.get("timestamp", ""), reverse=True)[:5]
-    
+
+    parts.append("**By Type:**\n")
+    parts.extend(
+        f"- {reason}: {count}\n"
+        for reason, count in sorted(reasons.items(), key=lambda x: x[1], reverse=True)
+    )
+
+    # Recent attempts — top-5 via a heap, O(N) instead of a full sort
+    recent = heapq.nlargest(5, attempts, key=lambda x: x.get("timestamp", ""))
+
     if recent:
-        report += "\n**Recent Attempts:**\n"
-        for attempt in recent:
-            report += f"- @{attempt.get('username')}: {attempt.get('move')} ({attempt.get('reason')})\n"
-    
-    return report
+        parts.append("\n**Recent Attempts:**\n")
+        parts.extend(
+            f"- @{attempt.get('username')}: {attempt.get('move')} ({attempt.get('reason')})\n"
+            for attempt in recent
+        )
+
+    return "".join(parts)
 
 def get_ip_security_report() -> str:
     """Generate IP-based security report"""
     suspicious = get_suspicious_ips()
     
-    report = f"🔒 IP Security Report\n\n"
-    report += f"**Suspicious IPs:** {len(suspicious)}\n\n"
-    
-    for ip_info in suspicious:
-        report += f"**IP:** {ip_info['ip_hash']}\n"
-        report += f"- Users: {', '.join(ip_info['users'])}\n"
-        report += f"- Violations: {ip_info['violations']}\n"
-        report += f"- Moves: {ip_info['move_count']}\n"
-        report += f"- First seen: {ip_info['first_seen']}\n\n"
-    
-    return report
+    parts = [
+        "🔒 IP Security Report\n\n",
+        f"**Suspicious IPs:** {len(suspicious)}\n\n",
+    ]
+
+    parts.extend(
+        f"**IP:** {ip_info['ip_hash']}\n"
+        f"- Users: {', '.join(ip_info['users'])}\n"
+        f"- Violations: {ip_info['violations']}\n"
+        f"- Moves: {ip_info['move_count']}\n"
+        f"- First seen: {ip_info['first_seen']}\n\n"
+        for ip_info in suspicious
+    )
+
+    return "".join(parts)
 
 # ============================================================================
 # INTEGRATION HELPERS
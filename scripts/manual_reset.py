@@ -5,7 +5,6 @@ Manual game reset with improved error handling and locking
 
 import os
 import sys
-import time
 import json
 from datetime import datetime, UTC
 from github import Github, Auth
@@ -15,9 +14,9 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(__file__))
 from common import (
     CONFIG, load_json_safe, save_json_safe, generate_ships, init_empty_board,
-    render_board, render_ship_status, render_game_stats, render_move_history,
-    render_leaderboard, render_all_time_leaderboard, update_readme_section,
-    ensure_directories
+    render_board_cached, render_ship_status_cached, render_game_stats,
+    render_move_history, render_leaderboard, render_all_time_leaderboard,
+    update_readme_sections, ensure_directories
 )
 
 # ============================================================================
@@ -32,8 +31,10 @@ ensure_directories()
 
 try:
     auth = Auth.Token(GITHUB_TOKEN)
-    g = Github(auth=auth)
-    repo = g.get_repo(REPO_NAME)
+    # Max page size: any paginated listing costs 3x fewer API calls
+    g = Github(auth=auth, per_page=100)
+    # lazy=True: skip the repo metadata fetch, only the issue is needed
+    repo = g.get_repo(REPO_NAME, lazy=True)
     issue = repo.get_issue(number=ISSUE_NUMBER)
 except Exception as e:
     print(f"ERROR: Failed to connect to GitHub: {str(e)}")
@@ -90,7 +91,8 @@ def reset_game_state(ships: dict) -> bool:
 def update_readme() -> bool:
     """Update README with reset game state"""
     try:
-        with open("README.md", "r") as f:
+        # Bytes mode: one decode-free pass over the emoji-heavy README
+        with open("README.md", "rb") as f:
             readme = f.read()
         
         # Load fresh data to render
@@ -98,38 +100,23 @@ def update_readme() -> bool:
         ships = load_json_safe("game/ships.json", default={})
         all_time_lb = load_json_safe("game2/all_time_leaderboard.json", default={})
         
-        # Update all sections
-        readme = update_readme_section(
-            readme, "<!-- BOARD_START -->", "<!-- BOARD_END -->",
-            render_board(board)
-        )
-        
-        readme = update_readme_section(
-            readme, "<!-- SHIP_STATUS_START -->", "<!-- SHIP_STATUS_END -->",
-            render_ship_status(ships, board)
-        )
-        
-        readme = update_readme_section(
-            readme, "<!-- GAME_STATS_START -->", "<!-- GAME_STATS_END -->",
-            render_game_stats(board, ships, {})
-        )
-        
-        readme = update_readme_section(
-            readme, "<!-- HISTORY_MOVES_START -->", "<!-- HISTORY_MOVES_END -->",
-            render_move_history([])
-        )
+        # Update all sections in one pass over the README
+        readme = update_readme_sections(readme, [
+            ("<!-- BOARD_START -->", "<!-- BOARD_END -->",
+             render_board_cached(board)),
+            ("<!-- SHIP_STATUS_START -->", "<!-- SHIP_STATUS_END -->",
+             render_ship_status_cached(ships, board)),
+            ("<!-- GAME_STATS_START -->", "<!-- GAME_STATS_END -->",
+             render_game_stats(board, ships, {})),
+            ("<!-- HISTORY_MOVES_START -->", "<!-- HISTORY_MOVES_END -->",
+             render_move_history([])),
+            ("<!-- LEADERBOARD_START -->", "<!-- LEADERBOARD_END -->",
+             render_leaderboard({}, {})),
+            ("<!-- ALL_TIME_START -->", "<!-- ALL_TIME_END -->",
+             render_all_time_leaderboard(all_time_lb)),
+        ])
         
-        readme = update_readme_section(
-            readme, "<!-- LEADERBOARD_START -->", "<!-- LEADERBOARD_END -->",
-            render_leaderboard({}, {})
-        )
-        
-        readme = update_readme_section(
-            readme, "<!-- ALL_TIME_START -->", "<!-- ALL_TIME_END -->",
-            render_all_time_leaderboard(all_time_lb)
-        )
-        
-        with open("README.md", "w") as f:
+        with open("README.md", "wb") as f:
             f.write(readme)
         
         return True
@@ -142,11 +129,16 @@ def update_readme() -> bool:
 
 def main():
     print("🔄 Starting manual game reset...")
-    
+
+    # Progress is accumulated and posted as ONE comment at the end; each
+    # create_comment is a full API round-trip and counts against the rate
+    # limit. Error paths still comment immediately before exiting.
+    status_lines = []
+
     # Step 1: Generate ships
     print("📍 Generating new ship positions...")
     ships, error_msg = generate_new_ships()
-    
+
     if ships is None:
         error_text = (
             f"❌ **Ship Generation Failed**\n\n"
@@ -158,14 +150,14 @@ def main():
         )
         issue.create_comment(error_text)
         sys.exit(1)
-    
-    issue.create_comment(f"✅ Generated new ship positions ({len(ships)} cells)")
-    
+
+    status_lines.append(f"✅ Generated new ship positions ({len(ships)} cells)")
+
     # Step 2: Reset game state
     print("🔄 Resetting game state...")
     try:
         reset_game_state(ships)
-        issue.create_comment("✅ Game state reset (board cleared, leaderboard reset)")
+        status_lines.append("✅ Game state reset (board cleared, leaderboard reset)")
     except Exception as e:
         error_text = (
             f"❌ **Game Reset Failed**\n\n"
@@ -174,12 +166,12 @@ def main():
         )
         issue.create_comment(error_text)
         sys.exit(1)
-    
+
     # Step 3: Update README
     print("📝 Updating README...")
     try:
         update_readme()
-        issue.create_comment("✅ README updated with reset board state")
+        status_lines.append("✅ README updated with reset board state")
     except Exception as e:
         error_text = (
             f"⚠️ **README Update Warning**\n\n"
@@ -188,10 +180,10 @@ def main():
         )
         issue.create_comment(error_text)
         sys.exit(1)
-    
+
     # Final summary
     ship_json_str = json.dumps(ships, indent=2)
-    
+
     summary = (
         "🔄 **Manual Game Reset Complete!**\n\n"
         "✅ New ships generated and positioned\n"
@@ -207,15 +199,15 @@ def main():
         "2. Update `SHIPS_JSON` with the JSON above\n"
         "3. Game is ready! 🎯"
     )
-    
-    issue.create_comment(summary)
+
+    issue.create_comment("\n".join(status_lines) + "\n\n" + summary)
     
     print("✅ Manual reset completed successfully!")
     print(f"Ship configuration saved to game/ships.json")
     print("Remember to update SHIPS_JSON secret for production security!")
     
-    # Close issue after delay
-    time.sleep(30)
+    # Close immediately — the summary comment stands on its own, and a
+    # 30-second stall here was pure billed runner time
     issue.edit(state="closed")
 
 if __name__ == "__main__":